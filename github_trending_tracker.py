@@ -1,90 +1,123 @@
 #!/usr/bin/env python3
 import os
-import json
+import atexit
+import queue
+import asyncio
+import orjson
 import requests
 import logging
-from bs4 import BeautifulSoup
+import sqlite3
+from logging.handlers import QueueHandler, QueueListener
+from bisect import bisect_right
 from datetime import datetime
+from functools import lru_cache, partial
+from itertools import accumulate
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from dotenv import load_dotenv
 
+from trending import HEADERS, Repo, fetch_trending_repos, parse_stars
+
+
+# Configure logging: records are formatted and queued, a background thread writes them to file
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, logging.FileHandler("logs.log", mode="a"))
+log_listener.start()
+atexit.register(log_listener.stop)
 
-# Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    filename="logs.log",
+    handlers=[QueueHandler(log_queue)],
     format='%(asctime)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
 logger = logging.getLogger(__name__)
 
-# File to store repository data
+# Database to store repository data
+HISTORY_DB = "history.sqlite"
+# Legacy JSON history, imported into the database on first run
 DATA_FILE = "github_trending_history.json"
 CONFIG_FILE = "telegram_config.json"
 
+TELEGRAM_MAX_LENGTH = 4096
+
+# Shared HTTP session so Telegram sends reuse one pooled connection
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(
+    # Only retry what Telegram rejected without posting: connection failures
+    # and 429. Retrying a sendMessage after 5xx or a read error could
+    # duplicate the post
+    max_retries=Retry(
+        total=3,
+        read=0,
+        backoff_factor=1,
+        status_forcelist=(429,),
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False
+    )
+))
+
+
+def open_history():
+    """Open the history database, creating and seeding it if needed"""
+    conn = sqlite3.connect(HISTORY_DB)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS repos("
+        "repo TEXT PRIMARY KEY, description TEXT, language TEXT, stars INTEGER, first_seen TEXT)"
+    )
+
+    if count_history(conn) == 0 and os.path.exists(DATA_FILE):
+        try:
+            with open(DATA_FILE, "rb") as f:
+                legacy = orjson.loads(f.read())
+            add_to_history(conn, [
+                Repo(
+                    name=repo["repo"],
+                    description=repo["description"],
+                    language=repo["language"],
+                    stars=parse_stars(repo["stars"]),
+                    first_seen=repo["first_seen"]
+                )
+                for repo in legacy.values()
+            ])
+            logger.info(f"Imported {DATA_FILE} into {HISTORY_DB}")
+        except orjson.JSONDecodeError:
+            logger.error(f"Error reading {DATA_FILE}, starting with empty history")
+
+    return conn
+
+def known_repos(conn, names):
+    """Return the names that are already in the history"""
+    names = list(names)
+    if not names:
+        return set()
+
+    placeholders = ",".join("?" * len(names))
+    rows = conn.execute(f"SELECT repo FROM repos WHERE repo IN ({placeholders})", names)
+    return {row[0] for row in rows}
+
+def find_new_repos(conn, repos):
+    """Return repositories that are not yet in the history"""
+    known = known_repos(conn, (repo.name for repo in repos))
+    return [repo for repo in repos if repo.name not in known]
+
+def add_to_history(conn, repos):
+    """Insert repositories into the history"""
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO repos(repo, description, language, stars, first_seen) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(r.name, r.description, r.language, r.stars, r.first_seen) for r in repos]
+        )
 
-def fetch_trending_repos():
-    """Fetch trending repositories from GitHub"""
-    url = "https://github.com/trending"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        logger.error(f"Error fetching data: {response.status_code}")
-        return []
-
-    soup = BeautifulSoup(response.text, "html.parser")
-    repo_articles = soup.select("article.Box-row")
-
-    repos = []
-    for article in repo_articles:
-        # Extract repository name (username/repo)
-        repo_link = article.select_one("h2 a")
-        if repo_link:
-            repo_path = repo_link.get("href", "").strip("/")
-
-            # Extract description
-            description_elem = article.select_one("p")
-            description = description_elem.text.strip() if description_elem else ""
-
-            # Extract language
-            language_elem = article.select_one("span[itemprop='programmingLanguage']")
-            language = language_elem.text.strip() if language_elem else "Unknown"
-
-            # Extract stars
-            stars_elem = article.select("a.Link--muted")[0] if article.select("a.Link--muted") else None
-            stars = stars_elem.text.strip() if stars_elem else "0"
-
-            repos.append({
-                "repo": repo_path,
-                "description": description,
-                "language": language,
-                "stars": stars,
-                "first_seen": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-    return repos
-
-def load_history():
-    """Load previously saved repository data"""
-    if not os.path.exists(DATA_FILE):
-        return {}
-
-    try:
-        with open(DATA_FILE, "r") as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        logger.error(f"Error reading {DATA_FILE}, starting with empty history")
-        return {}
-
-def save_history(history):
-    """Save repository data to file"""
-    with open(DATA_FILE, "w") as f:
-        json.dump(history, f, indent=2)
+def count_history(conn):
+    """Return number of tracked repositories"""
+    return conn.execute("SELECT COUNT(*) FROM repos").fetchone()[0]
 
+@lru_cache(maxsize=1)
 def return_telegram_config():
     """Return Telegram configuration"""
     load_dotenv()
@@ -106,67 +139,82 @@ def send_to_telegram(message, config):
         "disable_web_page_preview": True  # Disable URL previews
     }
 
-    response = requests.post(url, data=payload)
+    try:
+        response = SESSION.post(url, data=payload)
+    except requests.RequestException as e:
+        logger.error(f"Error sending message to Telegram: {e}")
+        return False
     return response.status_code == 200
 
+def send_all_to_telegram(messages, config):
+    """Send messages to Telegram in order, return number delivered"""
+    return sum(send_to_telegram(message, config) for message in messages)
+
 def format_repos_for_telegram(repos):
-    """Format all new repositories for a single Telegram message"""
+    """Format new repositories into Telegram messages that fit the length limit"""
     today = datetime.now().strftime("%Y-%m-%d")
 
     if not repos:
-        return None
-
-    message = f"<b>🔥 New GitHub Trending Repositories ({today})</b>\n\n"
+        return []
 
+    parts = [f"<b>🔥 New GitHub Trending Repositories ({today})</b>\n\n"]
     for i, repo in enumerate(repos, 1):
-        repo_url = f"https://github.com/{repo['repo']}"
-        message += (
-            f"{i}. <a href='{repo_url}'>{repo['repo']}</a>\n"
-            f"<b>Language:</b> {repo['language']} | <b>Stars:</b> {repo['stars']}\n"
-            f"<b>Description:</b> {repo['description']}\n\n"
+        parts.append(
+            f"{i}. <a href='{repo.url}'>{repo.name}</a>\n"
+            f"<b>Language:</b> {repo.language} | <b>Stars:</b> {repo.stars:,}\n"
+            f"<b>Description:</b> {repo.description}\n\n"
         )
-
-    message += f"Total new repositories: {len(repos)}"
-    return message
-
-def main():
+    parts.append(f"Total new repositories: {len(repos)}")
+
+    # Split at the last part that still fits within the limit
+    lens = list(accumulate(map(len, parts)))
+    messages = []
+    start = 0
+    offset = 0
+    while start < len(parts):
+        end = max(bisect_right(lens, offset + TELEGRAM_MAX_LENGTH, lo=start), start + 1)
+        messages.append("".join(parts[start:end]))
+        offset = lens[end - 1]
+        start = end
+
+    return messages
+
+async def main():
     # Load Telegram configuration
     telegram_config = return_telegram_config()
 
-    # Load existing history
-    history = load_history()
+    # Open existing history
+    history = open_history()
 
-    # Fetch current trending repositories
-    current_repos = fetch_trending_repos()
+    # Fetch current trending repositories, skipping pages with nothing new
+    current_repos = await fetch_trending_repos(known_names=partial(known_repos, history))
 
     # Find new repositories
-    new_repos = []
-    for repo in current_repos:
-        repo_name = repo["repo"]
-        if repo_name not in history:
-            new_repos.append(repo)
-            history[repo_name] = repo
+    new_repos = find_new_repos(history, current_repos)
 
-    # Save updated history
-    save_history(history)
+    # Save new repositories to history
+    add_to_history(history, new_repos)
 
     # Display results
     if new_repos:
         logger.info(f"Found {len(new_repos)} new trending repositories:")
 
-    # Send all new repositories as a single message to Telegram
-    message = format_repos_for_telegram(new_repos)
+    # Send all new repositories to Telegram, most starred first, split to fit the message limit
+    new_repos.sort(key=lambda repo: repo.stars, reverse=True)
+    messages = format_repos_for_telegram(new_repos)
 
-    if message:
-        success = send_to_telegram(message, telegram_config)
+    if messages:
+        sent = send_all_to_telegram(messages, telegram_config)
 
-        if success:
+        if sent == len(messages):
             logger.info("Sent update to Telegram ✓")
         else:
-            logger.error("Failed to send update to Telegram ✗")
+            logger.error(f"Failed to send {len(messages) - sent} of {len(messages)} messages to Telegram ✗")
+
+        logger.info(f"Total repositories tracked: {count_history(history)}")
 
-        logger.info(f"Total repositories tracked: {len(history)}")
+    history.close()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
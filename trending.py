@@ -0,0 +1,238 @@
+import os
+import re
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import lru_cache
+
+import aiohttp
+import orjson
+
+
+logger = logging.getLogger(__name__)
+
+# Validators and parsed results of the last successful fetch, per URL
+CACHE_FILE = "trending_cache.json"
+
+# Start of each trending row, and its repository link matched without building a tree
+ROW_MARKER = '<article class="Box-row"'
+HREF_RE = re.compile(re.escape(ROW_MARKER) + r'.*?<h2[^>]*>\s*<a[^>]*href="([^"]+)"', re.DOTALL)
+
+TRENDING_URL = "https://github.com/trending"
+TIMEFRAMES = ("daily", "weekly", "monthly")
+# Seconds a single page fetch may take before it is given up
+FETCH_TIMEOUT = 30
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate, br"
+}
+
+
+@dataclass(slots=True)
+class Repo:
+    """Trending repository record"""
+    name: str
+    description: str = ""
+    language: str = "Unknown"
+    stars: int = 0
+    first_seen: str = ""
+
+    @property
+    def url(self):
+        """Repository page on GitHub"""
+        return f"https://github.com/{self.name}"
+
+
+def load_cache():
+    """Load cached ETag/Last-Modified validators and results"""
+    if not os.path.exists(CACHE_FILE):
+        return {}
+
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            return orjson.loads(f.read())
+    except orjson.JSONDecodeError:
+        logger.error(f"Error reading {CACHE_FILE}, starting with empty cache")
+        return {}
+
+def save_cache(cache):
+    """Save validators and results to file"""
+    with open(CACHE_FILE, "wb") as f:
+        f.write(orjson.dumps(cache))
+
+def extract_repo_names(html):
+    """Return repository names on a trending page without a full parse"""
+    return {match.group(1).strip("/") for match in HREF_RE.finditer(html)}
+
+async def fetch_repos(session, url, cache, known_names=None):
+    """Fetch and parse a trending page, reusing cached results on 304"""
+    entry = cache.get(url)
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and entry:
+                return [Repo(**repo) for repo in entry["repos"]]
+            if response.status != 200:
+                logger.error(f"Error fetching {url}: {response.status}")
+                return []
+            html = await response.text()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Error fetching {url}: {e!r}")
+        return []
+
+    # known_names returns the already seen subset of names; skip the full
+    # parse when the page has nothing new, and cache that empty result so a
+    # later 304 for the same page also yields nothing. Only trust the scan if
+    # it found a name for every row, otherwise a missed row could hide a new repo
+    names = extract_repo_names(html) if known_names is not None else None
+    if names and len(names) == html.count(ROW_MARKER) and not names - known_names(names):
+        repos = []
+    else:
+        # Parse in a worker thread so other pages keep downloading meanwhile
+        repos = await asyncio.to_thread(parse_trending, html)
+
+    if etag or last_modified:
+        cache[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "repos": [asdict(repo) for repo in repos]
+        }
+    else:
+        cache.pop(url, None)
+
+    return repos
+
+async def fetch_trending_repos(known_names=None):
+    """Fetch trending repositories from GitHub for all timeframes concurrently"""
+    cache = load_cache()
+
+    timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT)
+    async with aiohttp.ClientSession(headers=HEADERS, timeout=timeout) as session:
+        tasks = [fetch_repos(session, f"{TRENDING_URL}?since={t}", cache, known_names) for t in TIMEFRAMES]
+        pages = await asyncio.gather(*tasks)
+
+    save_cache(cache)
+
+    repos = []
+    seen = set()
+    for page in pages:
+        for repo in page:
+            if repo.name not in seen:
+                seen.add(repo.name)
+                repos.append(repo)
+
+    return repos
+
+def parse_stars(text):
+    """Convert a star count such as "1,234" to int"""
+    try:
+        return int(text.strip().replace(",", ""))
+    except ValueError:
+        return 0
+
+@lru_cache(maxsize=1)
+def lexbor_parser():
+    """Import selectolax on first use, return None if it is not installed"""
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        return None
+    return LexborHTMLParser
+
+@lru_cache(maxsize=1)
+def lxml_selectors():
+    """Import lxml on first use and compile CSS selectors to XPath once"""
+    from lxml import etree
+    from cssselect import GenericTranslator
+
+    css_to_xpath = GenericTranslator().css_to_xpath
+    return tuple(
+        etree.XPath(css_to_xpath(css))
+        for css in ("article.Box-row", "h2 a", "p", "span[itemprop='programmingLanguage']", "a.Link--muted")
+    )
+
+def parse_trending(html):
+    """Extract repositories from trending page HTML"""
+    if lexbor_parser() is not None:
+        return parse_repos_lexbor(html)
+    return parse_repos_lxml(html)
+
+def parse_repos_lexbor(html):
+    """Extract repositories from trending page HTML using selectolax"""
+    tree = lexbor_parser()(html)
+
+    repos = []
+    for article in tree.css("article.Box-row"):
+        # Extract repository name (username/repo)
+        repo_link = article.css_first("h2 a")
+        if repo_link is None:
+            continue
+        repo_path = (repo_link.attributes.get("href") or "").strip("/")
+
+        # Extract description
+        description_elem = article.css_first("p")
+        description = description_elem.text().strip() if description_elem else ""
+
+        # Extract language
+        language_elem = article.css_first("span[itemprop='programmingLanguage']")
+        language = language_elem.text().strip() if language_elem else "Unknown"
+
+        # Extract stars
+        stars_elem = article.css_first("a.Link--muted")
+        stars = parse_stars(stars_elem.text()) if stars_elem else 0
+
+        repos.append(Repo(
+            name=repo_path,
+            description=description,
+            language=language,
+            stars=stars,
+            first_seen=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        ))
+
+    return repos
+
+def parse_repos_lxml(html):
+    """Extract repositories from trending page HTML using lxml"""
+    from lxml import html as lxml_html
+
+    xp_row, xp_link, xp_desc, xp_lang, xp_stars = lxml_selectors()
+    doc = lxml_html.fromstring(html)
+
+    repos = []
+    for article in xp_row(doc):
+        # Extract repository name (username/repo)
+        repo_links = xp_link(article)
+        if not repo_links:
+            continue
+        repo_path = repo_links[0].get("href", "").strip("/")
+
+        # Extract description
+        description_elems = xp_desc(article)
+        description = description_elems[0].text_content().strip() if description_elems else ""
+
+        # Extract language
+        language_elems = xp_lang(article)
+        language = language_elems[0].text_content().strip() if language_elems else "Unknown"
+
+        # Extract stars
+        stars_elems = xp_stars(article)
+        stars = parse_stars(stars_elems[0].text_content()) if stars_elems else 0
+
+        repos.append(Repo(
+            name=repo_path,
+            description=description,
+            language=language,
+            stars=stars,
+            first_seen=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        ))
+
+    return repos